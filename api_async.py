@@ -0,0 +1,159 @@
+"""
+Async read-only JSON API for dashboards that poll the job list and Judy tasks.
+
+Runs as its own ASGI process next to the Flask app and shares its model
+definitions and query builders:
+
+    uvicorn api_async:app --host 0.0.0.0 --port 38292
+
+The database URL comes from ASYNC_DATABASE_URL if set (e.g.
+"sqlite+aiosqlite:///jbi.db" for local work), otherwise from config.py using
+the aiomysql driver.
+"""
+import os
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app import (
+    FILTERABLE_FIELDS,
+    JUDY_RECENT_DAYS,
+    JUDY_TASK_COLUMNS,
+    JobRow,
+    _calculate_totals,
+    _index_jobs_select,
+    _job_amounts,
+    _judy_tasks_select,
+    _project_names_select,
+    jobs_detail,
+    jobs_index,
+    judy_task_line,
+)
+
+
+def _database_url():
+    url = os.getenv("ASYNC_DATABASE_URL")
+    if url:
+        return url
+    from config import (
+        mysql_username,
+        mysql_password,
+        mysql_host,
+        mysql_port,
+        mysql_dbname,
+    )
+
+    return (
+        f"mysql+aiomysql://{mysql_username}:{mysql_password}@"
+        f"{mysql_host}:{mysql_port}/{mysql_dbname}"
+    )
+
+
+def _to_json(obj):
+    """Column values of a model instance as a JSON-safe dict."""
+    data = {}
+    for column in obj.__table__.columns:
+        value = getattr(obj, column.key)
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        data[column.key] = value
+    return data
+
+
+def _filters(request):
+    """Starlette counterpart of app._get_filter_values."""
+    return {field: (request.query_params.get(field) or "").strip() for field in FILTERABLE_FIELDS}
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Engine is created per process, after any fork by the ASGI server
+    engine = create_async_engine(_database_url(), pool_pre_ping=True)
+    app.state.sessionmaker = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    try:
+        yield
+    finally:
+        await engine.dispose()
+
+
+async def jobs_list(request):
+    async with request.app.state.sessionmaker() as session:
+        result = await session.execute(_index_jobs_select(_filters(request)))
+        rows = [JobRow._make(row) for row in result]
+    return JSONResponse(
+        {
+            "jobs": [row._asdict() for row in rows],
+            "totals": _calculate_totals(rows, _job_amounts),
+        }
+    )
+
+
+async def job_detail(request):
+    job_id = request.path_params["job_id"]
+    async with request.app.state.sessionmaker() as session:
+        detail = await session.get(jobs_detail, job_id)
+        if detail is None:
+            return JSONResponse({"error": f"Job {job_id} not found"}, status_code=404)
+        summary = await session.get(jobs_index, job_id)
+        tasks = (
+            await session.scalars(
+                select(judy_task_line)
+                .filter(judy_task_line.job_id == job_id)
+                .order_by(judy_task_line.date)
+            )
+        ).all()
+    return JSONResponse(
+        {
+            "job": _to_json(detail),
+            "totals": _calculate_totals([summary] if summary else [], _job_amounts),
+            "judy_tasks": [_to_json(task) for task in tasks],
+        }
+    )
+
+
+async def judy_tasks(request):
+    """Same rows and order as /judy_full_tasks: open tasks, then recently completed."""
+    cutoff = datetime.utcnow().date() - timedelta(days=JUDY_RECENT_DAYS)
+    async with request.app.state.sessionmaker() as session:
+        rows = (await session.execute(_judy_tasks_select(cutoff))).all()
+        names = dict((await session.execute(_project_names_select())).all())
+
+    tasks = []
+    for row in rows:
+        task = dict(zip(JUDY_TASK_COLUMNS, row))
+        project_name = names.get(task["job_id"])
+        if project_name is None:
+            continue
+        task["project_name"] = project_name
+        tasks.append(task)
+    tasks.sort(key=lambda task: (task["flag_complete"] != 0, task["date"] or date.min, task["task_id"]))
+    for task in tasks:
+        task["date"] = task["date"].isoformat() if task["date"] else None
+    return JSONResponse({"tasks": tasks})
+
+
+async def totals(request):
+    stmt = _index_jobs_select(_filters(request)).with_only_columns(
+        jobs_index.purchase_amount,
+        jobs_index.commission_at_sale,
+        jobs_index.commission_net_due,
+    )
+    async with request.app.state.sessionmaker() as session:
+        rows = (await session.execute(stmt)).all()
+    return JSONResponse({"count": len(rows), "totals": _calculate_totals(rows, _job_amounts)})
+
+
+app = Starlette(
+    routes=[
+        Route("/api/jobs", jobs_list),
+        Route("/api/jobs/{job_id:int}", job_detail),
+        Route("/api/judy_tasks", judy_tasks),
+        Route("/api/totals", totals),
+    ],
+    lifespan=lifespan,
+)
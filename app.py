@@ -1,42 +1,37 @@
 import os
 import sys
+import time
 import logging
-from datetime import datetime, timedelta
-
-from flask import Flask, render_template, request, redirect, url_for, flash
+import threading
+import weakref
+from bisect import bisect_left, insort
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from flask import Blueprint, Flask, g, has_app_context, render_template, request, redirect, url_for, flash, jsonify
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import func, or_
-
-from config import (
-    mysql_username,
-    mysql_password,
-    mysql_host,
-    mysql_port,
-    mysql_dbname,
-)
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import event, func, select, union
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 
 # -----------------------------------------------------------------------------
 # Flask + SQLAlchemy setup
 # -----------------------------------------------------------------------------
-app = Flask(__name__)
-# Needed for `flash()` to work (sessions)
-app.config["SECRET_KEY"] = os.getenv("FLASK_SECRET_KEY", "JBIWATER")
-app.config["SQLALCHEMY_DATABASE_URI"] = (
-    f"mysql+mysqldb://{mysql_username}:{mysql_password}@"
-    f"{mysql_host}:{mysql_port}/{mysql_dbname}"
-)
-db = SQLAlchemy(app)
-
-# Logging
-logging.basicConfig(
-    format="%(levelname)s - %(name)s - %(message)s",
-    level=logging.INFO,
-    stream=sys.stdout,
-)
+# Nothing here touches the database or config.py; create_app() binds the
+# extension and blueprint to an application.
+db = SQLAlchemy()
+bp = Blueprint("main", __name__, cli_group=None)
 log = logging.getLogger(__name__)
 
 FILTERABLE_FIELDS = ("project_name", "account", "jbi_number", "market", "contractor")
 
+# Filter-result cache sizing (see _FilterResultCache)
+FILTER_CACHE_MAX_BYTES = int(os.getenv("FILTER_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
 # -----------------------------------------------------------------------------
 # Utility helpers
 # -----------------------------------------------------------------------------
@@ -52,7 +47,7 @@ def _to_float(v):
     try:
         if v is None:
             return 0.0
-        if isinstance(v, (int, float)):
+        if isinstance(v, (int, float, Decimal)):
             return float(v)
 
         # Normalize text representation
@@ -80,6 +75,19 @@ def _get_filter_values(args, fields=FILTERABLE_FIELDS):
     return {field: (args.get(field, type=str) or "").strip() for field in fields}
 
 
+def _normalize_filters(filters):
+    """
+    Build an order-independent cache key from a _get_filter_values dict.
+    Values are trimmed and lower-cased (as ILIKE compares them); empty
+    fields are dropped.
+    """
+    return tuple(sorted(
+        (field, str(value).strip().lower())
+        for field, value in filters.items()
+        if value and str(value).strip()
+    ))
+
+
 def _apply_filters(query, model, filters):
     """Apply ilike filters to a SQLAlchemy query for the provided fields."""
     for field, value in filters.items():
@@ -266,6 +274,12 @@ class sales_detail(db.Model):
         return f"<SalesDetail {self.auto_id}:{self.auto_id}>"
     
 class judy_task_line(db.Model):
+    # Each branch of _judy_tasks_select() is served by one of these
+    __table_args__ = (
+        db.Index("ix_judy_task_line_open", "flag_complete", "date"),
+        db.Index("ix_judy_task_line_date", "date"),
+    )
+
     task_id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer)
     flag_complete = db.Column(db.Integer)
@@ -277,6 +291,797 @@ class judy_task_line(db.Model):
         return f"<JudyTaskLine {self.task_id}:{self.task_id}>"
 
 
+class job_rollup(db.Model):
+    """Monthly job counts and amounts per market/contractor (see _maintain_job_rollups)."""
+    date_basis = db.Column(db.String(10), primary_key=True)  # "order" or "ship"
+    period = db.Column(db.Date, primary_key=True)  # first day of the month
+    market = db.Column(db.String(200), primary_key=True, default="")
+    contractor = db.Column(db.String(200), primary_key=True, default="")
+    job_count = db.Column(db.Integer, nullable=False, default=0)
+    purchase_amount = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    commission_at_sale = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    commission_net_due = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<JobRollup {self.date_basis}:{self.period}:{self.market}:{self.contractor}>"
+
+
+class cache_version(db.Model):
+    """Shared write counters, bumped in the same transaction as the writes they track."""
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CacheVersion {self.name}:{self.version}>"
+
+
+# -----------------------------------------------------------------------------
+# Shared write versions
+# -----------------------------------------------------------------------------
+# Tables that feed the jobs_index view; a write to any of them bumps the
+# shared "jobs" version and so invalidates every cached search result.
+JOB_WRITE_MODELS = (
+    jobs,
+    jobs_detail,
+    jobs_commission,
+    jobs_commission_line,
+    commission_detail_line,
+)
+JOBS_VERSION = "jobs"
+# Bumped by judy_task_line writes; keeps every worker's judy_queue current
+JUDY_VERSION = "judy_tasks"
+
+VERSIONED_MODELS = {
+    JOBS_VERSION: JOB_WRITE_MODELS,
+    JUDY_VERSION: (judy_task_line,),
+}
+
+
+def _bump_cache_version(session, name):
+    """Increment a cache_version row inside the session's transaction; returns the new value."""
+    table = cache_version.__table__
+    result = session.execute(
+        table.update().where(table.c.name == name).values(version=table.c.version + 1)
+    )
+    if result.rowcount == 0:
+        session.execute(table.insert().values(name=name, version=1))
+    return session.execute(select(table.c.version).where(table.c.name == name)).scalar_one()
+
+
+def _ensure_cache_versions():
+    """
+    Create cache_version if missing and seed a row per VERSIONED_MODELS name,
+    so that concurrent first writes only ever UPDATE.
+    """
+    table = cache_version.__table__
+    table.create(db.session.get_bind(), checkfirst=True)
+    existing = set(db.session.execute(select(table.c.name)).scalars())
+    missing = [name for name in VERSIONED_MODELS if name not in existing]
+    if not missing:
+        return
+    try:
+        db.session.execute(table.insert(), [{"name": name, "version": 0} for name in missing])
+        db.session.commit()
+    except IntegrityError:
+        # Another process seeded them first
+        db.session.rollback()
+
+
+def _cache_versions():
+    """All cache_version counters, read once per app context (i.e. once per request)."""
+    if "cache_versions" not in g:
+        table = cache_version.__table__
+        g.cache_versions = dict(db.session.execute(select(table.c.name, table.c.version)).all())
+    return g.cache_versions
+
+
+def _cache_version(name):
+    return _cache_versions().get(name, 0)
+
+
+@event.listens_for(db.session, "before_flush")
+def _bump_cache_versions(session, flush_context, instances):
+    """
+    Bump each VERSIONED_MODELS counter once per transaction that writes one
+    of its tables. The new values are kept in session.info["versions_bumped"].
+    """
+    bumped = session.info.setdefault("versions_bumped", {})
+    objs = (*session.new, *session.dirty, *session.deleted)
+    for name, models in VERSIONED_MODELS.items():
+        if name not in bumped and any(isinstance(obj, models) for obj in objs):
+            bumped[name] = _bump_cache_version(session, name)
+
+
+@event.listens_for(db.session, "after_commit")
+def _reset_versions_after_commit(session):
+    session.info.pop("versions_bumped", None)
+    # Let the rest of this request see the versions it just committed
+    if has_app_context():
+        g.pop("cache_versions", None)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _reset_versions_after_rollback(session):
+    session.info.pop("versions_bumped", None)
+
+
+# -----------------------------------------------------------------------------
+# Filter-result cache
+# -----------------------------------------------------------------------------
+class _FilterResultCache:
+    """
+    LRU cache of search results keyed on normalized filter values.
+
+    Each entry holds the matching JobRow tuples (in display order) plus the
+    precomputed totals, tagged with the shared jobs version it was built
+    under. Seeing a different version drops every entry, so a write on any
+    worker invalidates the cache on all of them.
+    """
+
+    # Rough per-entry overhead (key tuple, totals dict, OrderedDict node)
+    ENTRY_OVERHEAD_BYTES = 512
+
+    def __init__(self, max_bytes=FILTER_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.generation = None
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _entry_size(self, rows):
+        return self.ENTRY_OVERHEAD_BYTES + sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in rows
+        )
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry["size"]
+
+    def _observe(self, version):
+        """
+        Clear everything once a newer version shows up (lock held). Returns
+        False for a version older than the cache's, e.g. from a request that
+        read its versions before another thread committed.
+        """
+        if self.generation is not None and version < self.generation:
+            return False
+        if version != self.generation:
+            if self.generation is not None:
+                self.invalidations += 1
+            self.generation = version
+            self._entries.clear()
+            self._bytes = 0
+        return True
+
+    def get(self, key, version):
+        """Return (rows, totals) for key under `version`, or None on a miss (or a stale version)."""
+        with self._lock:
+            entry = self._entries.get(key) if self._observe(version) else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry["rows"]), dict(entry["totals"])
+
+    def put(self, key, rows, totals, version):
+        """Store a result computed under `version`; results from an older version are ignored."""
+        rows = tuple(rows)
+        size = self._entry_size(rows)
+        with self._lock:
+            if not self._observe(version) or size > self.max_bytes:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = {"rows": rows, "totals": dict(totals), "size": size}
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+filter_cache = _FilterResultCache()
+
+
+def _cached_job_search(scope, filters, load_rows, amount_getter):
+    """
+    Run a filtered job search through filter_cache.
+
+    On a miss, `load_rows()` is called and its rows and totals are cached
+    under (scope, normalized filters); a hit touches no job tables at all.
+    Returns (rows, totals) where rows are JobRow tuples ordered by job_id
+    descending.
+    """
+    key = (scope, _normalize_filters(filters))
+    version = _cache_version(JOBS_VERSION)
+    cached = filter_cache.get(key, version)
+    if cached is not None:
+        return cached
+
+    rows = load_rows()
+    totals = _calculate_totals(rows, amount_getter)
+    filter_cache.put(key, rows, totals, version)
+    return rows, totals
+
+
+# -----------------------------------------------------------------------------
+# Shared read statements (also used by api_async.py)
+# -----------------------------------------------------------------------------
+def _job_amounts(job):
+    """Amount accessor for _calculate_totals over jobs_index rows."""
+    return {
+        "purchase_amount": job.purchase_amount,
+        "commission_at_sale": job.commission_at_sale,
+        "commission_net_due": job.commission_net_due,
+    }
+
+
+# List pages read these columns into plain tuples rather than jobs_index
+# entities, so no identity map or instance state is built per row.
+JOB_ROW_COLUMNS = (
+    "job_id",
+    "project_name",
+    "account",
+    "jbi_number",
+    "market",
+    "contractor",
+    "purchase_amount",
+    "commission_at_sale",
+    "commission_net_due",
+)
+JobRow = namedtuple("JobRow", JOB_ROW_COLUMNS)
+
+
+def _job_row_select(*extra_columns):
+    """select() of the JobRow columns, optionally followed by `extra_columns`."""
+    return select(*(getattr(jobs_index, column) for column in JOB_ROW_COLUMNS), *extra_columns)
+
+
+def _job_rows(stmt):
+    """Execute a _job_row_select() statement into JobRow tuples."""
+    return [JobRow._make(row) for row in db.session.execute(stmt)]
+
+
+def _job_rows_with_extra(stmt):
+    """Like _job_rows, for statements with one extra column: (JobRow, extra) pairs."""
+    width = len(JOB_ROW_COLUMNS)
+    return [(JobRow._make(row[:width]), row[width]) for row in db.session.execute(stmt)]
+
+
+def _index_jobs_select(filters):
+    """Filtered jobs_index rows shown on the job index, newest first."""
+    stmt = _apply_filters(_job_row_select(), jobs_index, filters)
+    # exclude entries with empty or null project_name
+    stmt = stmt.filter(jobs_index.project_name.isnot(None)).filter(jobs_index.project_name != "")
+    return stmt.order_by(jobs_index.job_id.desc())
+
+
+JUDY_TASK_COLUMNS = ("task_id", "job_id", "flag_complete", "date", "task")
+JUDY_RECENT_DAYS = 30
+
+
+def _judy_tasks_select(cutoff):
+    """
+    Open Judy tasks plus anything dated on/after `cutoff`, as plain columns.
+
+    Written as a UNION so each branch can use its own index instead of an
+    OR across two columns; UNION (not ALL) drops tasks matching both.
+    """
+    columns = [getattr(judy_task_line, column) for column in JUDY_TASK_COLUMNS]
+    return union(
+        select(*columns).where(judy_task_line.flag_complete == 0),
+        select(*columns).where(judy_task_line.date >= cutoff),
+    )
+
+
+def _project_names_select():
+    """job_id -> project_name pairs for jobs that have a project name."""
+    return select(jobs_index.job_id, jobs_index.project_name).where(
+        jobs_index.project_name.isnot(None)
+    )
+
+# -----------------------------------------------------------------------------
+# Time-series rollups
+# -----------------------------------------------------------------------------
+# Each job contributes one row per date basis: its (month, market, contractor)
+# bucket gets +1 job and the job's jobs_commission amounts.
+ROLLUP_BASES = {"order": "order_date", "ship": "ship_date"}
+ROLLUP_AMOUNTS = ("purchase_amount", "commission_at_sale", "commission_net_due")
+ROLLUP_DETAIL_FIELDS = ("market", "contractor", *ROLLUP_BASES.values())
+ROLLUP_GROUPABLE = ("market", "contractor")
+ROLLUP_CENT = Decimal("0.01")
+
+
+def _month_start(value):
+    """Return the first day of the month for a date, datetime or 'YYYY-MM[-DD...]' string."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date().replace(day=1)
+    if isinstance(value, date):
+        return value.replace(day=1)
+    try:
+        return datetime.strptime(str(value).strip()[:7], "%Y-%m").date()
+    except ValueError:
+        return None
+
+
+def _rollup_amount(value):
+    """Parse a jobs_commission amount into the Decimal stored in job_rollup."""
+    return Decimal(str(_to_float(value))).quantize(ROLLUP_CENT)
+
+
+def _rollup_contribution(detail_values, amounts):
+    """Map each rollup key a job falls into to the amounts it contributes."""
+    amounts = amounts or (Decimal("0.00"),) * len(ROLLUP_AMOUNTS)
+    contribution = {}
+    for basis, date_field in ROLLUP_BASES.items():
+        period = _month_start(detail_values[date_field])
+        if period is not None:
+            key = (basis, period, detail_values["market"] or "", detail_values["contractor"] or "")
+            contribution[key] = amounts
+    return contribution
+
+
+def _rollup_contributions(session, job_ids=None, for_update=False):
+    """
+    Map job_id -> contribution as currently stored in the database, for
+    `job_ids` or for every job. A job's amounts come from its jobs_commission
+    row with the lowest commission_id; jobs without one contribute zeros.
+
+    With `for_update`, the jobs_detail/jobs_commission rows are read with
+    SELECT ... FOR UPDATE: the read is current rather than a snapshot, and
+    concurrent writers of the same job wait for each other.
+    """
+    details = select(jobs_detail.job_id, *(getattr(jobs_detail, field) for field in ROLLUP_DETAIL_FIELDS))
+    commissions = select(
+        jobs_commission.job_id, *(getattr(jobs_commission, field) for field in ROLLUP_AMOUNTS)
+    ).order_by(jobs_commission.commission_id.desc())
+    if job_ids is not None:
+        if not job_ids:
+            return {}
+        details = details.where(jobs_detail.job_id.in_(job_ids))
+        commissions = commissions.where(jobs_commission.job_id.in_(job_ids))
+    if for_update:
+        details = details.with_for_update()
+        commissions = commissions.with_for_update()
+
+    with session.no_autoflush:
+        # Descending commission_id, so the lowest one per job is written last
+        amounts = {
+            job_id: tuple(_rollup_amount(value) for value in values)
+            for job_id, *values in session.execute(commissions)
+        }
+        return {
+            job_id: _rollup_contribution(dict(zip(ROLLUP_DETAIL_FIELDS, values)), amounts.get(job_id))
+            for job_id, *values in session.execute(details)
+        }
+
+
+def _rollup_buckets(contributions, sign=1, buckets=None):
+    """Add (sign=1) or subtract (sign=-1) per-job contributions into key -> [job_count, *amounts]."""
+    buckets = {} if buckets is None else buckets
+    for contribution in contributions.values():
+        for key, amounts in contribution.items():
+            bucket = buckets.setdefault(key, [0, *(Decimal("0.00"),) * len(ROLLUP_AMOUNTS)])
+            bucket[0] += sign
+            for i, amount in enumerate(amounts, start=1):
+                bucket[i] += sign * amount
+    return buckets
+
+
+def _upsert_rollup(session, key, job_count, amounts):
+    """Atomically add a delta to one rollup row, creating it if needed."""
+    table = job_rollup.__table__
+    basis, period, market, contractor = key
+    values = dict(
+        date_basis=basis,
+        period=period,
+        market=market,
+        contractor=contractor,
+        job_count=job_count,
+        **dict(zip(ROLLUP_AMOUNTS, amounts)),
+    )
+    additive = ("job_count", *ROLLUP_AMOUNTS)
+    dialect = session.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(table).values(**values)
+        stmt = stmt.on_duplicate_key_update(
+            {col: table.c[col] + stmt.inserted[col] for col in additive}
+        )
+        session.execute(stmt)
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[c.name for c in table.primary_key],
+            set_={col: table.c[col] + stmt.excluded[col] for col in additive},
+        )
+        session.execute(stmt)
+    else:
+        match = [table.c[col] == values[col] for col in ("date_basis", "period", "market", "contractor")]
+        result = session.execute(
+            table.update().where(*match).values({col: table.c[col] + values[col] for col in additive})
+        )
+        if result.rowcount == 0:
+            session.execute(table.insert().values(**values))
+
+    session.execute(
+        table.delete().where(
+            table.c.date_basis == basis,
+            table.c.period == period,
+            table.c.market == market,
+            table.c.contractor == contractor,
+            table.c.job_count <= 0,
+        )
+    )
+
+
+def _rollup_job_ids(session, objs):
+    """job_ids (current and previous) of the jobs_detail/jobs_commission rows among `objs`."""
+    job_ids = set()
+    for obj in objs:
+        if not isinstance(obj, (jobs_detail, jobs_commission)):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        job_ids.add(obj.job_id)
+        job_ids.update(sa_inspect(obj).attrs.job_id.history.deleted)
+    job_ids.discard(None)
+    return job_ids
+
+
+@event.listens_for(db.session, "before_flush")
+def _snapshot_job_rollups(session, flush_context, instances):
+    """
+    Read, and lock, the pre-flush contribution of every job whose detail or
+    commission row is in this flush. Without the lock, two transactions
+    editing the same job would both subtract the same old contribution.
+    """
+    with session.no_autoflush:
+        job_ids = _rollup_job_ids(session, (*session.new, *session.dirty, *session.deleted))
+        session.info["rollup_before"] = (
+            job_ids,
+            _rollup_contributions(session, job_ids, for_update=True),
+        )
+
+
+@event.listens_for(db.session, "after_flush")
+def _maintain_job_rollups(session, flush_context):
+    """
+    Apply the rollup delta (old contribution out, new contribution in) for
+    every job snapshotted in before_flush, plus new rows whose job_id was only
+    assigned by the flush. Both sides are read back from the database with
+    _rollup_contributions, the same rule rebuild_job_rollups uses, and the
+    delta is written in the same transaction as the write itself.
+    """
+    job_ids, before = session.info.pop("rollup_before", (set(), {}))
+    job_ids = job_ids | _rollup_job_ids(session, session.new)
+    if not job_ids:
+        return
+
+    deltas = _rollup_buckets(before, sign=-1)
+    _rollup_buckets(_rollup_contributions(session, job_ids), buckets=deltas)
+    for key, (job_count, *amounts) in deltas.items():
+        if job_count or any(amounts):
+            _upsert_rollup(session, key, job_count, amounts)
+
+
+def _stored_rollups():
+    """job_rollup rows as key -> (job_count, *amounts)."""
+    return {
+        (row.date_basis, row.period, row.market, row.contractor): (
+            row.job_count,
+            *(_rollup_amount(getattr(row, field)) for field in ROLLUP_AMOUNTS),
+        )
+        for row in db.session.query(job_rollup)
+    }
+
+
+def _ensure_job_rollups():
+    """Create and backfill job_rollup if missing, so the write hooks always have a table."""
+    if sa_inspect(db.session.get_bind()).has_table(job_rollup.__table__.name):
+        return
+    log.info("job_rollup is missing; rebuilt %s rows", rebuild_job_rollups())
+
+
+def rebuild_job_rollups():
+    """Recompute job_rollup from scratch (creating the table if missing)."""
+    job_rollup.__table__.create(db.session.get_bind(), checkfirst=True)
+    buckets = _rollup_buckets(_rollup_contributions(db.session))
+
+    db.session.query(job_rollup).delete()
+    db.session.add_all(
+        job_rollup(
+            date_basis=basis,
+            period=period,
+            market=market,
+            contractor=contractor,
+            job_count=job_count,
+            **dict(zip(ROLLUP_AMOUNTS, amounts)),
+        )
+        for (basis, period, market, contractor), (job_count, *amounts) in buckets.items()
+    )
+    db.session.commit()
+    return len(buckets)
+
+
+def diff_job_rollups():
+    """Keys whose stored job_rollup row differs from a rebuild: key -> (stored, expected)."""
+    expected = {key: tuple(bucket) for key, bucket in _rollup_buckets(_rollup_contributions(db.session)).items()}
+    stored = _stored_rollups()
+    return {
+        key: (stored.get(key), expected.get(key))
+        for key in stored.keys() | expected.keys()
+        if stored.get(key) != expected.get(key)
+    }
+
+
+def _query_rollups(basis, start=None, end=None, filters=None, group_by=()):
+    """
+    Sum rollup rows for a date range (inclusive months), grouped by period
+    plus any of ROLLUP_GROUPABLE. Returns (rows, totals).
+    """
+    group_cols = [job_rollup.period] + [getattr(job_rollup, field) for field in group_by]
+    q = db.session.query(
+        *group_cols,
+        func.sum(job_rollup.job_count),
+        *(func.sum(getattr(job_rollup, field)) for field in ROLLUP_AMOUNTS),
+    ).filter(job_rollup.date_basis == basis)
+    if start:
+        q = q.filter(job_rollup.period >= start)
+    if end:
+        q = q.filter(job_rollup.period <= end)
+    q = _apply_filters(q, job_rollup, filters or {})
+
+    rows = []
+    for record in q.group_by(*group_cols).order_by(*group_cols).all():
+        row = {"period": record[0].strftime("%Y-%m")}
+        row.update(zip(group_by, record[1 : 1 + len(group_by)]))
+        job_count, *amounts = record[1 + len(group_by):]
+        row["job_count"] = int(job_count or 0)
+        row.update((field, _to_float(amount)) for field, amount in zip(ROLLUP_AMOUNTS, amounts))
+        rows.append(row)
+
+    totals = _calculate_totals(rows, lambda row: row)
+    totals["job_count"] = sum(row["job_count"] for row in rows)
+    return rows, totals
+
+
+def _get_rollup_params(args):
+    """Parse the shared query-string parameters for the trends views."""
+    basis = args.get("basis", "order")
+    if basis not in ROLLUP_BASES:
+        basis = "order"
+    return {
+        "basis": basis,
+        "start": _month_start(args.get("start")),
+        "end": _month_start(args.get("end")),
+        "filters": _get_filter_values(args, ROLLUP_GROUPABLE),
+        "group_by": tuple(field for field in ROLLUP_GROUPABLE if field in args.getlist("group_by")),
+    }
+
+
+# -----------------------------------------------------------------------------
+# Judy task queue
+# -----------------------------------------------------------------------------
+JudyTask = namedtuple("JudyTask", JUDY_TASK_COLUMNS)
+
+JUDY_BUCKETS = {
+    "overdue": "Overdue",
+    "week": "Due This Week",
+    "completed": "Recently Completed",
+}
+
+
+def _to_date(value):
+    """Coerce a date, datetime or 'YYYY-MM-DD...' string to a date (None if unparseable)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value).strip()[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+class _JudyTaskQueue:
+    """
+    Open and completed Judy tasks, each kept sorted by due date.
+
+    Loaded from _judy_tasks_select() and then patched in place after every
+    commit that touches judy_task_line, so the bucket methods are a bisect
+    plus a slice. Undated open tasks sort first. The queue is per process;
+    each request compares it with the shared JUDY_VERSION and reloads it if
+    another worker has written since.
+
+    The bucket methods take the job_id -> project_name map and return
+    (task, project_name) pairs. Tasks whose job has no project name are left
+    out of both the pairs and counts(), so the counts match the list.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks = None
+        self._open = []
+        self._done = []
+        self._version = None
+
+    @staticmethod
+    def _key(task):
+        return (task.date or date.min, task.task_id)
+
+    def _lists_for(self, task):
+        return self._open if task.flag_complete == 0 else self._done
+
+    def _insert(self, task):
+        self._tasks[task.task_id] = task
+        insort(self._lists_for(task), self._key(task))
+
+    def _remove(self, task_id):
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            keys = self._lists_for(task)
+            del keys[bisect_left(keys, self._key(task))]
+
+    def _ensure_loaded(self):
+        """Reload if missing or behind the shared version (lock held, so apply() can't interleave)."""
+        version = _cache_version(JUDY_VERSION)
+        if self._tasks is not None and self._version == version:
+            return
+        cutoff = datetime.utcnow().date() - timedelta(days=JUDY_RECENT_DAYS)
+        rows = db.session.execute(_judy_tasks_select(cutoff)).all()
+        self._tasks, self._open, self._done = {}, [], []
+        for row in rows:
+            task = JudyTask(*row)
+            self._tasks[task.task_id] = task
+            self._lists_for(task).append(self._key(task))
+        self._open.sort()
+        self._done.sort()
+        self._version = version
+
+    def apply(self, changes, version):
+        """
+        Apply {task_id: JudyTask or None (deleted)} from a transaction that
+        committed JUDY_VERSION `version`. If the queue has missed a write in
+        between, it is dropped and reloaded on next use instead.
+        """
+        with self._lock:
+            if self._tasks is None:
+                return
+            if version is None or self._version != version - 1:
+                self._tasks, self._open, self._done = None, [], []
+                return
+            for task_id, task in changes.items():
+                self._remove(task_id)
+                if task is not None:
+                    self._insert(task)
+            self._version = version
+
+    def _range(self, keys, start=None, stop=None):
+        lo = bisect_left(keys, (start, 0)) if start else 0
+        hi = bisect_left(keys, (stop, 0)) if stop else len(keys)
+        return keys[lo:hi]
+
+    def _named(self, keys, names):
+        pairs = []
+        for _, task_id in keys:
+            task = self._tasks[task_id]
+            project_name = names.get(task.job_id)
+            if project_name is not None:
+                pairs.append((task, project_name))
+        return pairs
+
+    def all_tasks(self, today, names):
+        """Every open task, then tasks completed in the last JUDY_RECENT_DAYS."""
+        with self._lock:
+            self._ensure_loaded()
+            keys = self._open + self._range(self._done, start=today - timedelta(days=JUDY_RECENT_DAYS))
+            return self._named(keys, names)
+
+    def overdue(self, today, names):
+        with self._lock:
+            self._ensure_loaded()
+            return self._named(self._range(self._open, start=date.min + timedelta(days=1), stop=today), names)
+
+    def due_this_week(self, today, names):
+        with self._lock:
+            self._ensure_loaded()
+            return self._named(self._range(self._open, start=today, stop=today + timedelta(days=7)), names)
+
+    def recently_completed(self, today, names):
+        with self._lock:
+            self._ensure_loaded()
+            return self._named(self._range(self._done, start=today - timedelta(days=JUDY_RECENT_DAYS)), names)
+
+    def counts(self, today, names):
+        """Bucket sizes, counting only tasks whose job has a project name."""
+        with self._lock:
+            self._ensure_loaded()
+            def span(keys, start, stop=None):
+                return sum(
+                    1
+                    for _, task_id in self._range(keys, start, stop)
+                    if names.get(self._tasks[task_id].job_id) is not None
+                )
+
+            return {
+                "overdue": span(self._open, date.min + timedelta(days=1), today),
+                "week": span(self._open, today, today + timedelta(days=7)),
+                "completed": span(self._done, today - timedelta(days=JUDY_RECENT_DAYS)),
+            }
+
+
+class _ProjectNameMap:
+    """Cached job_id -> project_name, rebuilt whenever the shared jobs version moves."""
+
+    def __init__(self):
+        self._names = None
+        self._version = None
+
+    def get(self):
+        version = _cache_version(JOBS_VERSION)
+        if self._names is None or self._version != version:
+            self._names = dict(db.session.execute(_project_names_select()).all())
+            self._version = version
+        return self._names
+
+
+judy_queue = _JudyTaskQueue()
+project_names = _ProjectNameMap()
+
+
+@event.listens_for(db.session, "after_flush")
+def _track_judy_writes(session, flush_context):
+    """Snapshot judy_task_line rows written in this flush (ids are assigned by now)."""
+    if JUDY_VERSION in session.info.get("versions_bumped", {}):
+        session.info["judy_version"] = session.info["versions_bumped"][JUDY_VERSION]
+    changes = session.info.setdefault("judy_changes", {})
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, judy_task_line):
+            changes[obj.task_id] = JudyTask(
+                obj.task_id, obj.job_id, obj.flag_complete, _to_date(obj.date), obj.task
+            )
+    for obj in session.deleted:
+        if isinstance(obj, judy_task_line):
+            changes[obj.task_id] = None
+
+
+@event.listens_for(db.session, "after_commit")
+def _apply_judy_writes(session):
+    changes = session.info.pop("judy_changes", None)
+    version = session.info.pop("judy_version", None)
+    if changes:
+        judy_queue.apply(changes, version)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _reset_judy_writes(session):
+    session.info.pop("judy_changes", None)
+    session.info.pop("judy_version", None)
+
+
 def _get_all_engineers():
     return engineer.query.order_by(engineer.engineer_name).all()
 
@@ -284,7 +1089,7 @@ def _get_all_engineers():
 def _get_all_sales():
     return sales.query.order_by(sales.sales_name).all()
 
-@app.route("/", methods=["POST", "GET"])
+@bp.route("/", methods=["POST", "GET"])
 def index():
     if request.method == "POST":
         try:
@@ -300,17 +1105,12 @@ def index():
 
     try:
         filters = _get_filter_values(request.args)
-        base_q = _apply_filters(jobs_index.query, jobs_index, filters)
-        # exclude entries with empty or null project_name
-        base_q = base_q.filter(jobs_index.project_name.isnot(None)).filter(jobs_index.project_name != "")
-        jobs_summary = base_q.order_by(jobs_index.job_id.desc()).all()
-        job_detail_totals = _calculate_totals(
-            jobs_summary,
-            lambda job: {
-                "purchase_amount": job.purchase_amount,
-                "commission_at_sale": job.commission_at_sale,
-                "commission_net_due": job.commission_net_due,
-            },
+
+        jobs_summary, job_detail_totals = _cached_job_search(
+            "index",
+            filters,
+            lambda: _job_rows(_index_jobs_select(filters)),
+            _job_amounts,
         )
         return render_template(
             "index.html",
@@ -322,7 +1122,12 @@ def index():
         log.exception("Error loading index page")
         return "Error loading index page"
 
-@app.route("/detail/<int:job_id>/commission_line", methods=["POST"])
+@bp.route("/cache_stats", methods=["GET"])
+def cache_stats():
+    """Expose filter-result cache hit rates and sizing."""
+    return jsonify(filter_cache.stats())
+
+@bp.route("/detail/<int:job_id>/commission_line", methods=["POST"])
 def commission_line(job_id):
     commission_line_amount = request.form.get("commission_amount")
     commission_line_date = request.form.get("date")
@@ -337,7 +1142,7 @@ def commission_line(job_id):
         return redirect(f"/detail/{job_id}#commission-section")
     return "There was an issue updating the commission line information", 500
     
-@app.route("/detail/<int:job_id>", methods=["GET"])
+@bp.route("/detail/<int:job_id>", methods=["GET"])
 def detail(job_id):
     """View job detail page (read-only)."""
     try:
@@ -379,7 +1184,7 @@ def detail(job_id):
         log.exception(f"Error loading detail page for job_id={job_id}")
         return "There was an issue gathering details on the job", 500
 
-@app.route("/detail/<int:job_id>/edit", methods=["GET", "POST"])
+@bp.route("/detail/<int:job_id>/edit", methods=["GET", "POST"])
 def detail_edit(job_id):
     """Edit job detail information."""
     job_detail = jobs_detail.query.get_or_404(job_id)
@@ -420,7 +1225,7 @@ def detail_edit(job_id):
         show_save=True, cancel_url=f"/detail/{job_id}", title=f"{job_detail.project_name} - Edit Job"
     )
 
-@app.route("/detail/<int:job_id>/judy_edit", methods=["GET", "POST"])
+@bp.route("/detail/<int:job_id>/judy_edit", methods=["GET", "POST"])
 def detail_edit_judy(job_id):
     """Edit Judy task information."""
     job_detail = jobs_detail.query.get_or_404(job_id)
@@ -457,7 +1262,7 @@ def detail_edit_judy(job_id):
         show_save=True, cancel_url=f"/detail/{job_id}", title="Edit Judy Task"
     )
 
-@app.route("/engineers", methods=["GET", "POST"])
+@bp.route("/engineers", methods=["GET", "POST"])
 def engineers():
     engineers_list = engineer.query.order_by(engineer.engineer_name).all()
     if request.method == "POST":
@@ -475,7 +1280,7 @@ def engineers():
         return "There was an issue updating the engineers information", 500
     return render_template("engineers.html", engineers_list=engineers_list)
 
-@app.route("/delete/engineer/<int:engineer_id>", methods=["POST"])
+@bp.route("/delete/engineer/<int:engineer_id>", methods=["POST"])
 def engineers_delete(engineer_id):
     eng = engineer.query.get_or_404(engineer_id)
     db.session.delete(eng)
@@ -483,7 +1288,7 @@ def engineers_delete(engineer_id):
         return "There was an issue deleting the engineer information", 500
     return redirect("/engineers")
 
-@app.route("/engineers/<int:engineer_id>/detail", methods=["GET", "POST"])
+@bp.route("/engineers/<int:engineer_id>/detail", methods=["GET", "POST"])
 def engineer_detail_view(engineer_id):
     eng = engineer.query.get_or_404(engineer_id)
     if request.method == "POST":
@@ -496,12 +1301,12 @@ def engineer_detail_view(engineer_id):
 
     filters = _get_filter_values(request.args)
     jobs_query = (
-        db.session.query(jobs_index, job_engineer.engineer_id)
+        _job_row_select(job_engineer.engineer_id)
         .join(job_engineer, jobs_index.job_id == job_engineer.job_id)
         .filter(job_engineer.engineer_id == engineer_id)
     )
     jobs_query = _apply_filters(jobs_query, jobs_index, filters)
-    jobs_summary = jobs_query.order_by(jobs_index.job_id.desc()).all()
+    jobs_summary = _job_rows_with_extra(jobs_query.order_by(jobs_index.job_id.desc()))
     job_detail_totals = _calculate_totals(
         jobs_summary,
         lambda row: {
@@ -523,7 +1328,7 @@ def engineer_detail_view(engineer_id):
     )
 
 
-@app.route("/detail/<int:job_id>/edit_commission", methods=["GET", "POST"])
+@bp.route("/detail/<int:job_id>/edit_commission", methods=["GET", "POST"])
 def job_commission_edit(job_id):
     """Edit job commission details."""
     job_detail = jobs_detail.query.get_or_404(job_id)
@@ -567,7 +1372,7 @@ def job_commission_edit(job_id):
         show_save=True, cancel_url=f"/detail/{job_id}#commission-section", title="Edit Commission Details"
     )
 
-@app.route("/detail/delete_commission/<int:commission_line_id>", methods=["POST"])
+@bp.route("/detail/delete_commission/<int:commission_line_id>", methods=["POST"])
 def job_commission_delete(commission_line_id):
     """Deletes the commission entry (by commission_line_id) from jobs_commission_line."""
     commission_line = jobs_commission_line.query.get_or_404(commission_line_id)
@@ -581,7 +1386,7 @@ def job_commission_delete(commission_line_id):
     return "There was an issue deleting the job commission line", 500
 
 
-@app.route("/detail/<int:job_id>/edit_engineer", methods=["POST"])
+@bp.route("/detail/<int:job_id>/edit_engineer", methods=["POST"])
 def job_engineer_edit(job_id):
     selected_engineer_name = request.form.get("engineer_name")
     selected_engineer = engineer.query.filter_by(engineer_name=selected_engineer_name).first()
@@ -599,7 +1404,7 @@ def job_engineer_edit(job_id):
     # Already exists, just redirect
     return redirect(f"/detail/{job_id}")
 
-@app.route("/detail/<int:job_id>/edit_sales", methods=["POST"])
+@bp.route("/detail/<int:job_id>/edit_sales", methods=["POST"])
 def job_sales_edit(job_id):
     selected_sales_name = request.form.get("sales_name")
     job_percentage = request.form.get("job_percentage") or 100
@@ -624,7 +1429,7 @@ def job_sales_edit(job_id):
     # Already exists, just redirect
     return redirect(f"/detail/{job_id}")
 
-@app.route("/detail/delete_sales/<int:auto_id>", methods=["POST"])
+@bp.route("/detail/delete_sales/<int:auto_id>", methods=["POST"])
 def job_sales_delete(auto_id):
     """Deletes the sales entry (by auto_id) from jobs_sales."""
     sales_to_delete = jobs_sales.query.get_or_404(auto_id)
@@ -634,7 +1439,7 @@ def job_sales_delete(auto_id):
         return redirect(f"/detail/{job_id}")
     return "There was an issue deleting the job sales", 500
 
-@app.route("/detail/delete_engineer/<int:auto_id>", methods=["POST"])
+@bp.route("/detail/delete_engineer/<int:auto_id>", methods=["POST"])
 def job_engineer_delete(auto_id):
     """Deletes the engineer entry (by auto_id) from jobs_engineer."""
     engineer_to_delete = job_engineer.query.get_or_404(auto_id)
@@ -644,7 +1449,7 @@ def job_engineer_delete(auto_id):
         return redirect(f"/detail/{job_id}")
     return "There was an issue deleting the job engineer", 500
 
-@app.route("/sales", methods=["GET", "POST"])
+@bp.route("/sales", methods=["GET", "POST"])
 def sales_team():
     sales_list = _get_all_sales()
     if request.method == "POST":
@@ -662,12 +1467,12 @@ def sales_team():
         return "There was an issue updating the sales information", 500
     return render_template("sales_team.html", sales_list=sales_list)
 
-@app.route("/sales/<int:sales_id>/detail", methods=["GET", "POST"])
+@bp.route("/sales/<int:sales_id>/detail", methods=["GET", "POST"])
 def sales_detail_view(sales_id):
     sales_member = sales.query.get_or_404(sales_id)
 
     q = (
-        db.session.query(jobs_index, jobs_sales.job_percentage)
+        _job_row_select(jobs_sales.job_percentage)
         .join(jobs_sales, jobs_index.job_id == jobs_sales.job_id)
         .filter(jobs_sales.sales_id == sales_id)
     )
@@ -675,7 +1480,7 @@ def sales_detail_view(sales_id):
     filters = _get_filter_values(request.args)
     q = _apply_filters(q, jobs_index, filters)
 
-    jobs_summary = q.order_by(jobs_index.job_id.desc()).all()
+    jobs_summary = _job_rows_with_extra(q.order_by(jobs_index.job_id.desc()))
 
     job_detail_totals = _calculate_totals(
         jobs_summary,
@@ -704,7 +1509,7 @@ def sales_detail_view(sales_id):
     )
 
 
-@app.route("/delete/sales/<int:sales_id>", methods=["POST"])
+@bp.route("/delete/sales/<int:sales_id>", methods=["POST"])
 def sales_team_delete(sales_id):
     sales_to_delete = sales.query.get_or_404(sales_id)
     db.session.delete(sales_to_delete)
@@ -712,35 +1517,34 @@ def sales_team_delete(sales_id):
         return redirect("/sales")
     return "There was an issue deleting the sales information", 500
 
-@app.route("/judy_full_tasks", methods=["POST", "GET"])
+@bp.route("/judy_full_tasks", methods=["POST", "GET"])
 def judy_full_tasks():
-    one_month_ago = datetime.utcnow().date() - timedelta(days=30)
-
-    all_tasks = (
-        db.session.query(judy_task_line, jobs_index.project_name)
-        .outerjoin(jobs_index, jobs_index.job_id == judy_task_line.job_id)
-        .filter(
-            or_(
-                judy_task_line.flag_complete == 0,
-                judy_task_line.date >= one_month_ago
-            )
-        )
-        .filter(jobs_index.project_name.isnot(None))
-        .order_by(judy_task_line.flag_complete, judy_task_line.date)
-        .all()
-    )
+    today = datetime.utcnow().date()
+    bucket = request.args.get("bucket", "")
+    bucket_tasks = {
+        "overdue": judy_queue.overdue,
+        "week": judy_queue.due_this_week,
+        "completed": judy_queue.recently_completed,
+    }.get(bucket, judy_queue.all_tasks)
     try:
-        return render_template("judy_full_tasks.html", all_tasks=all_tasks)
+        names = project_names.get()
+        return render_template(
+            "judy_full_tasks.html",
+            all_tasks=bucket_tasks(today, names),
+            bucket=bucket,
+            buckets=JUDY_BUCKETS,
+            bucket_counts=judy_queue.counts(today, names),
+        )
     except Exception:
         log.exception("Error loading Judy Task page")
         return "Error loading Judy Task page"
 
-@app.route("/detail/<int:job_id>/add_judy_task", methods=["POST"])
+@bp.route("/detail/<int:job_id>/add_judy_task", methods=["POST"])
 def job_judy_add(job_id):
     date_val = request.form.get('date')
     if not date_val:
         flash('You need to have a date', 'warning')
-        return redirect(url_for('detail', job_id=job_id))
+        return redirect(url_for('main.detail', job_id=job_id))
 
     try:
         task = judy_task_line()
@@ -756,9 +1560,9 @@ def job_judy_add(job_id):
         flash('Error adding Judy task', 'danger')
         print('error', e)
     # Redirect back to the job detail and jump to the Judy section
-    return redirect(url_for('detail', job_id=job_id) + '#judy-section')
+    return redirect(url_for('main.detail', job_id=job_id) + '#judy-section')
     
-@app.route("/toggle_judy_task/<int:task_id>", methods=["POST"])
+@bp.route("/toggle_judy_task/<int:task_id>", methods=["POST"])
 def job_judy_toggle(task_id):
     """Toggle the completion status of a Judy task."""
     task = judy_task_line.query.get_or_404(task_id)
@@ -771,12 +1575,12 @@ def job_judy_toggle(task_id):
         # Redirect back to where user came from
         ref = request.referrer or ""
         if "/judy_full_tasks" in ref:
-            return redirect(url_for("judy_full_tasks"))
+            return redirect(url_for("main.judy_full_tasks"))
         return redirect(f"/detail/{task.job_id}#judy-section")
 
     return "There was an issue updating the Judy task", 500
 
-@app.route("/delete/judy_task/<int:task_id>", methods=["POST"])
+@bp.route("/delete/judy_task/<int:task_id>", methods=["POST"])
 def job_judy_delete(task_id):
     task_to_delete = judy_task_line.query.get_or_404(task_id)
     job_id = task_to_delete.job_id
@@ -785,6 +1589,231 @@ def job_judy_delete(task_id):
         return redirect(f"/detail/{job_id}#judy-section")
     return "There was an issue deleting the Judy task", 500
 
+@bp.route("/trends", methods=["GET"])
+def trends():
+    """Bookings and commission trends by month, summed from job_rollup."""
+    params = _get_rollup_params(request.args)
+    try:
+        rows, totals = _query_rollups(**params)
+    except Exception:
+        log.exception("Error loading trends page")
+        return "Error loading trends page", 500
+    return render_template(
+        "trends.html",
+        rows=rows,
+        job_detail_totals=totals,
+        params=params,
+        bases=ROLLUP_BASES,
+        groupable=ROLLUP_GROUPABLE,
+    )
+
+
+@bp.route("/api/trends", methods=["GET"])
+def trends_api():
+    """JSON version of /trends for dashboards and exports."""
+    params = _get_rollup_params(request.args)
+    try:
+        rows, totals = _query_rollups(**params)
+    except Exception:
+        log.exception("Error loading trends data")
+        return jsonify({"error": "Error loading trends data"}), 500
+    return jsonify(
+        {
+            "basis": params["basis"],
+            "start": params["start"].strftime("%Y-%m") if params["start"] else None,
+            "end": params["end"].strftime("%Y-%m") if params["end"] else None,
+            "group_by": list(params["group_by"]),
+            "rows": rows,
+            "totals": totals,
+        }
+    )
+
+
+@bp.cli.command("create-cache-tables")
+def create_cache_tables_command():
+    """Create and seed the cache_version table that job/commission/Judy writes bump."""
+    _ensure_cache_versions()
+    log.info("cache_version table is present")
+
+
+@bp.cli.command("create-indexes")
+def create_indexes_command():
+    """Create any indexes declared on the models that the database is missing."""
+    bind = db.session.get_bind()
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind, checkfirst=True)
+            log.info("Index %s on %s is present", index.name, table.name)
+
+
+@bp.cli.command("rebuild-rollups")
+def rebuild_rollups_command():
+    """Create job_rollup if needed and rebuild it from jobs_detail/jobs_commission."""
+    buckets = rebuild_job_rollups()
+    log.info("Rebuilt job_rollup: %s rows", buckets)
+
+
+@bp.cli.command("verify-rollups")
+def verify_rollups_command():
+    """Compare job_rollup with a rebuild from jobs_detail/jobs_commission; exit 1 on drift."""
+    mismatches = diff_job_rollups()
+    for key, (stored, expected) in sorted(mismatches.items()):
+        log.warning("job_rollup %s: stored %s, expected %s", key, stored, expected)
+    if mismatches:
+        sys.exit(1)
+    log.info("job_rollup matches jobs_detail/jobs_commission")
+
+
+@bp.teardown_app_request
+def shutdown_session(exception=None):
+    db.session.remove()
+
+
+# -----------------------------------------------------------------------------
+# Application factory
+# -----------------------------------------------------------------------------
+def _database_uri():
+    """Build the MySQL URI from config.py (imported lazily, at app creation)."""
+    from config import (
+        mysql_username,
+        mysql_password,
+        mysql_host,
+        mysql_port,
+        mysql_dbname,
+    )
+
+    return (
+        f"mysql+mysqldb://{mysql_username}:{mysql_password}@"
+        f"{mysql_host}:{mysql_port}/{mysql_dbname}"
+    )
+
+
+def _configure_logging():
+    """Install the stdout handler once, leaving gunicorn's handlers alone."""
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            format="%(levelname)s - %(name)s - %(message)s",
+            level=logging.INFO,
+            stream=sys.stdout,
+        )
+
+
+def _precompile_templates(app):
+    """Compile every template up front so workers never parse on first hit."""
+    for name in app.jinja_env.list_templates(extensions=("html",)):
+        app.jinja_env.get_template(name)
+
+
+def _warm_reference_caches():
+    """Prime the unfiltered job index search and the project-name map."""
+    filters = {field: "" for field in FILTERABLE_FIELDS}
+    _cached_job_search(
+        "index",
+        filters,
+        lambda: _job_rows(_index_jobs_select(filters)),
+        _job_amounts,
+    )
+    project_names.get()
+    db.session.remove()
+
+
+def _dispose_engines(app):
+    """Drop pooled connections inherited from the parent process."""
+    with app.app_context():
+        for engine in db.engines.values():
+            # close=False: leave the parent's sockets alone, just forget them
+            engine.dispose(close=False)
+
+
+# Apps built in this process; the fork hook below can only be registered once
+_APPS = weakref.WeakSet()
+
+
+def _dispose_all_engines():
+    for app in list(_APPS):
+        _dispose_engines(app)
+
+
+os.register_at_fork(after_in_child=_dispose_all_engines)
+
+
+def _log_first_request_latency(app, started):
+    state = {"logged": False}
+
+    @app.before_request
+    def _mark_request_start():
+        if not state["logged"]:
+            request.environ["jbi.request_started"] = time.perf_counter()
+
+    @app.after_request
+    def _log_first_request(response):
+        request_started = request.environ.get("jbi.request_started")
+        if not state["logged"] and request_started is not None:
+            state["logged"] = True
+            log.info(
+                "First request in pid %s: %.1f ms (%.1f ms after app creation)",
+                os.getpid(),
+                (time.perf_counter() - request_started) * 1000,
+                (time.perf_counter() - started) * 1000,
+            )
+        return response
+
+
+def create_app(config=None):
+    """
+    Build the Flask application.
+
+    `config` overrides app.config entries (e.g. SQLALCHEMY_DATABASE_URI).
+    Set JBI_WARMUP=true to prime reference caches at boot and
+    JINJA_CACHE_DIR to choose where compiled templates are stored.
+    """
+    started = time.perf_counter()
+    _configure_logging()
+
+    app = Flask(__name__)
+    # Needed for `flash()` to work (sessions)
+    app.config["SECRET_KEY"] = os.getenv("FLASK_SECRET_KEY", "JBIWATER")
+    app.config.update(config or {})
+    if "SQLALCHEMY_DATABASE_URI" not in app.config:
+        app.config["SQLALCHEMY_DATABASE_URI"] = _database_uri()
+
+    # Without JINJA_CACHE_DIR, Jinja picks a per-user temp dir and checks its owner
+    cache_dir = os.getenv("JINJA_CACHE_DIR")
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    app.jinja_options = {
+        **app.jinja_options,
+        "bytecode_cache": FileSystemBytecodeCache(cache_dir),
+    }
+
+    db.init_app(app)
+    app.register_blueprint(bp)
+
+    _precompile_templates(app)
+    with app.app_context():
+        try:
+            _ensure_cache_versions()
+        except Exception:
+            log.exception("Could not create the cache_version table")
+        try:
+            _ensure_job_rollups()
+        except Exception:
+            log.exception("Could not create the job_rollup table")
+        db.session.remove()
+    if os.getenv("JBI_WARMUP", "false").lower() == "true":
+        with app.app_context():
+            try:
+                _warm_reference_caches()
+            except Exception:
+                log.exception("Reference cache warm-up failed")
+    # Any connection opened above belongs to this process only
+    _dispose_engines(app)
+    _APPS.add(app)
+
+    _log_first_request_latency(app, started)
+    log.info("App created in %.1f ms", (time.perf_counter() - started) * 1000)
+    return app
+
 
 if __name__ == "__main__":
     # Read environment variables (for Docker or local)
@@ -793,8 +1822,4 @@ if __name__ == "__main__":
     host = os.getenv("FLASK_RUN_HOST", "0.0.0.0" if os.getenv("DOCKER_ENV") else "127.0.0.1")
 
     # Run Flask app
-    app.run(debug=debug, host=host, port=port)
-
-@app.teardown_appcontext
-def shutdown_session(exception=None):
-    db.session.remove()
\ No newline at end of file
+    create_app().run(debug=debug, host=host, port=port)
@@ -0,0 +1,220 @@
+"""
+Concurrent-client throughput of the sync Flask routes vs. api_async.py.
+
+Either point it at running servers:
+
+    python benchmarks/async_vs_sync.py --sync-url http://127.0.0.1:38291 \
+        --async-url http://127.0.0.1:38292
+
+or let it seed a throwaway SQLite database and start both servers itself
+(gunicorn sync workers vs. uvicorn with aiosqlite):
+
+    python benchmarks/async_vs_sync.py --spawn --workers 2 --concurrency 64
+
+SQLite has no network round trip, so --spawn mostly measures framework and
+serialization overhead; run against the real MySQL database to see the
+effect of DB wait on sync workers.
+
+The async API never caches, but the sync routes can answer from in-process
+caches (see SYNC_CACHES). --spawn starts gunicorn with FILTER_CACHE_MAX_BYTES=0,
+so sync "/" queries the database on every request like /api/jobs does. The
+Judy page is always served from judy_queue. The "sync cache" column shows
+which sync numbers include a cache.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (sync route, async equivalent)
+ROUTE_PAIRS = (
+    ("/", "/api/jobs"),
+    ("/judy_full_tasks", "/api/judy_tasks"),
+)
+
+# In-process cache behind each sync route, and whether --spawn can turn it off
+SYNC_CACHES = {
+    "/": ("filter_cache", True),
+    "/judy_full_tasks": ("judy_queue", False),
+}
+
+
+async def _get(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    status = (await reader.readline()).split()[1]
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return int(status)
+
+
+async def _load(url, path, concurrency, total):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    latencies, errors = [], 0
+    remaining = iter(range(total))
+
+    async def client():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                if await _get(host, port, path) != 200:
+                    errors += 1
+            except OSError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _seed(db_path, job_count, tasks_per_job):
+    sys.path.insert(0, ROOT)
+    import app as jbi
+
+    flask_app = jbi.create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}"})
+    today = date.today()
+    with flask_app.app_context():
+        jbi.db.create_all()
+        for job_id in range(1, job_count + 1):
+            jbi.db.session.add(
+                jbi.jobs_index(
+                    job_id=job_id,
+                    project_name=f"Project {job_id}",
+                    account=f"Account {job_id % 50}",
+                    jbi_number=f"JBI-{job_id:05d}",
+                    market=("Municipal", "Industrial", "Agriculture")[job_id % 3],
+                    contractor=f"Contractor {job_id % 40}",
+                    purchase_amount=str(1000 + job_id),
+                    commission_at_sale=str(100 + job_id % 100),
+                    commission_net_due=str(50 + job_id % 50),
+                )
+            )
+            for n in range(tasks_per_job):
+                jbi.db.session.add(
+                    jbi.judy_task_line(
+                        job_id=job_id,
+                        flag_complete=n % 2,
+                        task=f"Task {n}",
+                        date=today - timedelta(days=(job_id + n) % 60),
+                    )
+                )
+        jbi.db.session.commit()
+
+
+def _wait_for(port, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def _spawn(args):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="jbi_bench_"), "jbi.db")
+    _seed(db_path, args.jobs, args.tasks_per_job)
+    sync_port, async_port = _free_port(), _free_port()
+    env = {**os.environ, "ASYNC_DATABASE_URL": f"sqlite+aiosqlite:///{db_path}"}
+    procs = [
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn",
+                "-w", str(args.workers),
+                "-b", f"127.0.0.1:{sync_port}",
+                f"app:create_app({{'SQLALCHEMY_DATABASE_URI': 'sqlite:///{db_path}'}})",
+            ],
+            # An entry can never fit in 0 bytes, so filter_cache stores nothing
+            cwd=ROOT, env={**env, "FILTER_CACHE_MAX_BYTES": "0"},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        ),
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "api_async:app",
+                "--workers", str(args.workers),
+                "--port", str(async_port),
+                "--log-level", "warning",
+            ],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        ),
+    ]
+    _wait_for(sync_port)
+    _wait_for(async_port)
+    return f"http://127.0.0.1:{sync_port}", f"http://127.0.0.1:{async_port}", procs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sync-url")
+    parser.add_argument("--async-url")
+    parser.add_argument("--spawn", action="store_true", help="seed SQLite and start both servers")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--tasks-per-job", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    procs = []
+    if args.spawn:
+        args.sync_url, args.async_url, procs = _spawn(args)
+    elif not (args.sync_url and args.async_url):
+        parser.error("pass --spawn or both --sync-url and --async-url")
+
+    try:
+        print(
+            f"{'route':<32} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}  sync cache"
+        )
+        for sync_path, async_path in ROUTE_PAIRS:
+            cache, can_disable = SYNC_CACHES[sync_path]
+            if args.spawn and can_disable:
+                sync_cache = f"{cache} off"
+            else:
+                sync_cache = f"{cache} on"
+            for label, url, path, cached in (
+                ("sync ", args.sync_url, sync_path, sync_cache),
+                ("async", args.async_url, async_path, "none"),
+            ):
+                # one warm-up pass so both sides have hot pools (and any cache)
+                asyncio.run(_load(url, path, args.concurrency, args.concurrency))
+                result = asyncio.run(_load(url, path, args.concurrency, args.requests))
+                print(
+                    f"{label} {path:<26} {result['rps']:>8.1f} {result['p50_ms']:>8.1f} "
+                    f"{result['p95_ms']:>8.1f} {result['errors']:>7}  {cached}"
+                )
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Memory and CPU of loading list-page rows as jobs_index entities vs. JobRow tuples.
+
+Seeds an in-memory SQLite database and, for each strategy, reports the
+best-of-N load time and the memory held by the loaded rows (tracemalloc),
+scaled to 10k rows:
+
+    python benchmarks/list_rows.py --rows 10000 --repeat 5
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app as jbi  # noqa: E402
+
+
+def _seed(rows):
+    jbi.db.create_all()
+    jbi.db.session.execute(
+        jbi.jobs_index.__table__.insert(),
+        [
+            {
+                "job_id": job_id,
+                "project_name": f"Project {job_id}",
+                "account": f"Account {job_id % 50}",
+                "jbi_number": f"JBI-{job_id:05d}",
+                "market": ("Municipal", "Industrial", "Agriculture")[job_id % 3],
+                "contractor": f"Contractor {job_id % 40}",
+                "purchase_amount": str(1000 + job_id),
+                "commission_at_sale": str(100 + job_id % 100),
+                "commission_net_due": str(50 + job_id % 50),
+            }
+            for job_id in range(1, rows + 1)
+        ],
+    )
+    jbi.db.session.commit()
+
+
+def _load_entities():
+    return jbi.jobs_index.query.order_by(jbi.jobs_index.job_id.desc()).all()
+
+
+def _load_job_rows():
+    return jbi._job_rows(jbi._job_row_select().order_by(jbi.jobs_index.job_id.desc()))
+
+
+def _measure(loader, repeat):
+    timings = []
+    for _ in range(repeat):
+        jbi.db.session.remove()
+        gc.collect()
+        started = time.perf_counter()
+        rows = loader()
+        timings.append(time.perf_counter() - started)
+        del rows
+
+    jbi.db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    rows = loader()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(rows)
+    del rows
+    jbi.db.session.remove()
+    return count, min(timings), retained, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    flask_app = jbi.create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": "sqlite://",
+            "SQLALCHEMY_ENGINE_OPTIONS": {"poolclass": StaticPool},
+        }
+    )
+    with flask_app.app_context():
+        _seed(args.rows)
+        scale = 10000 / args.rows
+        print(f"{'strategy':<20} {'ms/10k':>8} {'retained KiB/10k':>17} {'peak KiB/10k':>13}")
+        for label, loader in (("jobs_index entities", _load_entities), ("JobRow tuples", _load_job_rows)):
+            count, best, retained, peak = _measure(loader, args.repeat)
+            assert count == args.rows
+            print(
+                f"{label:<20} {best * 1000 * scale:>8.1f} "
+                f"{retained / 1024 * scale:>17.0f} {peak / 1024 * scale:>13.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()